@@ -6,12 +6,21 @@ A proper TUI implementation for better display handling
 
 import subprocess
 import re
+import json
 import sqlite3
 import asyncio
 import requests
 import os
+import queue
+import threading
+import urllib.parse
+import heapq
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
+from hashlib import blake2b
 from typing import Dict, List, Optional
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, ScrollableContainer, Center
@@ -23,155 +32,300 @@ from textual import events, work
 from rich.text import Text
 from rich.table import Table
 
+# Precompiled patterns for the per-line parsing loops below; compiling once at
+# module load avoids the re-cache lookup on every scontrol/squeue line
+_NODE_NAME_RE = re.compile(r'NodeName=(\S+)')
+_NODE_STATE_RE = re.compile(r'State=(\S+)')
+_GRES_TOTAL_RE = re.compile(r'Gres=gpu:(\w+):(\d+)')
+_GRES_USED_RE = re.compile(r'GresUsed=gpu:\w+:(\d+)')
+_GPU_REQ_RE = re.compile(r'gpu:(\w+:)?(\d+)')
+# The prefix must not swallow brackets/commas, or multi-dimensional lists
+# like rack[1-2]node[01-02] would "expand" to nonexistent node names
+_NODELIST_RANGE_RE = re.compile(r'^([^\s\[\],]+?)\[([\d,\-]+)\]$')
+# Single scan for unhealthy node states instead of two substring passes
+_UNHEALTHY_RE = re.compile(r'DRAIN|DOWN')
+
+def build_gpu_summary(nodes):
+    """Aggregate per-GPU-type totals from node info in a single pass.
+
+    Shared by the overview widget, database logging and Discord notifications
+    so the reduction over all nodes runs once per refresh.
+    """
+    gpu_summary = {}
+    summary_get = gpu_summary.get  # hoisted: this loop is the hottest in the app
+
+    for node in nodes:
+        if 'gpu_type' in node:
+            gpu_type = node['gpu_type']
+            total = node.get('gpu_total', 0)
+            used = node.get('gpu_used', 0)
+            state = node.get('state', '')
+
+            info = summary_get(gpu_type)
+            if info is None:
+                info = {'total': 0, 'used': 0, 'nodes': 0,
+                        'drain_nodes': 0, 'true_available': 0, 'requested': 0}
+                gpu_summary[gpu_type] = info
+            info['total'] += total
+            info['used'] += used
+            info['nodes'] += 1
+
+            # Prefer the flag precomputed in get_node_info
+            if 'healthy' in node:
+                is_healthy = node['healthy']
+            else:
+                is_healthy = _UNHEALTHY_RE.search(state) is None
+            if not is_healthy:
+                info['drain_nodes'] += 1
+            else:
+                info['true_available'] += (total - used)
+
+    return gpu_summary
+
+def build_user_gpu_summary(nodes, allocations):
+    """Aggregate per-(user, GPU type) usage from allocations in a single pass.
+
+    Shared by the overview widget and database logging so the walk over all
+    allocations runs once per refresh. Flat (user, gpu_type) keys avoid the
+    nested-defaultdict double hash and per-key lambda allocations.
+    """
+    user_gpu_summary = {}
+    nodes_by_name = {n['name']: n for n in nodes if 'name' in n}
+
+    for node_name, alloc_info in allocations.items():
+        node_info = nodes_by_name.get(node_name)
+        if node_info and 'gpu_type' in node_info:
+            gpu_type = node_info['gpu_type']
+            for job in alloc_info.get('jobs', []):
+                key = (job['user'], gpu_type)
+                gpu_data = user_gpu_summary.get(key)
+                if gpu_data is None:
+                    gpu_data = {'count': 0, 'jobs': 0, 'nodes': set()}
+                    user_gpu_summary[key] = gpu_data
+                gpu_data['count'] += job['gpus']
+                gpu_data['jobs'] += 1
+                gpu_data['nodes'].add(node_name)
+
+    return user_gpu_summary
+
 class SlurmCommands:
     """Slurm command execution"""
-    
+
+    # Cache of parsed command output keyed by command name; on idle clusters
+    # scontrol/squeue output rarely changes between 30s polls, so a matching
+    # stdout hash lets us skip the regex parsing entirely
+    _parse_cache = {}
+
+    @staticmethod
+    def _check_cache(key, stdout):
+        """Return (digest, cached_result_or_None) for raw command output"""
+        digest = blake2b(stdout.encode(), digest_size=16).hexdigest()
+        cached = SlurmCommands._parse_cache.get(key)
+        if cached and cached[0] == digest:
+            return digest, cached[1]
+        return digest, None
+
     @staticmethod
     def get_node_info():
         """Get detailed node information from scontrol"""
         try:
-            result = subprocess.run(['scontrol', 'show', 'node', '-d'], 
-                                   capture_output=True, text=True, timeout=10)
-            
+            # Bytes mode skips allocating a stderr buffer we never read and the
+            # UTF-8 codec pass over potentially large output; scontrol emits
+            # ASCII, so decode once here
+            result = subprocess.run(['scontrol', 'show', 'node', '-d'],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   timeout=10)
+
             if result.returncode != 0:
+                SlurmCommands._parse_cache.pop('nodes', None)
                 return []
-            
+
+            stdout = result.stdout.decode('ascii', errors='replace')
+            digest, cached = SlurmCommands._check_cache('nodes', stdout)
+            if cached is not None:
+                return cached
+
+            # scontrol separates nodes with blank lines; parse each block with
+            # the compiled patterns directly instead of a line-at-a-time state
+            # machine with per-line branching
             nodes = []
-            current_node = {}
-            
-            for line in result.stdout.split('\n'):
-                if line.startswith('NodeName='):
-                    if current_node:
-                        nodes.append(current_node)
-                    current_node = {'name': line.split()[0].split('=')[1]}
-                elif 'State=' in line:
-                    match = re.search(r'State=(\S+)', line)
-                    if match:
-                        current_node['state'] = match.group(1)
-                elif 'Gres=gpu:' in line:
-                    match = re.search(r'gpu:(\w+):(\d+)', line)
-                    if match:
-                        current_node['gpu_type'] = match.group(1)
-                        current_node['gpu_total'] = int(match.group(2))
-                elif 'GresUsed=gpu:' in line:
-                    match = re.search(r'gpu:\w+:(\d+)', line)
-                    if match:
-                        current_node['gpu_used'] = int(match.group(1))
-            
-            if current_node:
-                nodes.append(current_node)
-            
+            for block in stdout.split('\n\n'):
+                name_match = _NODE_NAME_RE.search(block)
+                if name_match is None:
+                    continue
+                node = {'name': name_match.group(1)}
+
+                match = _NODE_STATE_RE.search(block)
+                if match:
+                    node['state'] = match.group(1)
+                match = _GRES_TOTAL_RE.search(block)
+                if match:
+                    node['gpu_type'] = match.group(1)
+                    node['gpu_total'] = int(match.group(2))
+                match = _GRES_USED_RE.search(block)
+                if match:
+                    node['gpu_used'] = int(match.group(1))
+
+                # Tag health at parse time so widgets and logging don't
+                # rescan the state string per node on every refresh
+                node['healthy'] = _UNHEALTHY_RE.search(node.get('state', '')) is None
+                nodes.append(node)
+
+            SlurmCommands._parse_cache['nodes'] = (digest, nodes)
             return nodes
         except subprocess.TimeoutExpired:
+            # Drop the stale digest so the empty result forces a UI update
+            SlurmCommands._parse_cache.pop('nodes', None)
             return []
         except Exception as e:
+            SlurmCommands._parse_cache.pop('nodes', None)
             return []
     
     @staticmethod
-    def get_job_allocations():
-        """Get current job allocations with user information"""
+    def get_all_jobs():
+        """Get running allocations and queued jobs from a single squeue call"""
         try:
-            result = subprocess.run(['squeue', '-o', '%N|%u|%T|%b|%j|%i'], 
-                                   capture_output=True, text=True, timeout=10)
-            
+            result = subprocess.run(['squeue', '-o', '%N|%u|%T|%b|%j|%i|%Q|%S|%l'],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   timeout=10)
+
             if result.returncode != 0:
-                return {}
-            
+                SlurmCommands._parse_cache.pop('jobs', None)
+                return {}, []
+
+            stdout = result.stdout.decode('ascii', errors='replace')
+            digest, cached = SlurmCommands._check_cache('jobs', stdout)
+            if cached is not None:
+                return cached
+
             allocations = defaultdict(lambda: {'users': set(), 'jobs': []})
-            
-            for line in result.stdout.split('\n')[1:]:
-                if not line or '|' not in line:
-                    continue
-                parts = line.split('|')
-                if len(parts) >= 5:
-                    nodelist = parts[0]
-                    user = parts[1]
-                    state = parts[2]
-                    gres = parts[3]
-                    jobname = parts[4]
-                    jobid = parts[5] if len(parts) > 5 else 'N/A'
-                    
-                    if state == 'RUNNING' and 'gpu' in gres:
-                        gpu_match = re.search(r'gpu:(\w+:)?(\d+)', gres)
-                        if gpu_match:
-                            gpu_count = int(gpu_match.group(2))
-                            
-                            # For job allocations, we need to handle per-node GPU count differently
-                            # The GPU count in squeue is total for the job, not per node
-                            nodes = SlurmCommands.expand_nodelist(nodelist)
-                            gpu_per_node = gpu_count // len(nodes) if len(nodes) > 0 else gpu_count
-                            for node in nodes:
-                                allocations[node]['users'].add(user)
-                                allocations[node]['jobs'].append({
-                                    'user': user,
-                                    'job': jobname,
-                                    'jobid': jobid,
-                                    'gpus': gpu_per_node
-                                })
-            
-            return allocations
-        except Exception as e:
-            return {}
-    
-    @staticmethod
-    def get_queued_jobs():
-        """Get queued jobs information"""
-        try:
-            result = subprocess.run(['squeue', '-o', '%u|%T|%b|%j|%i|%Q|%S|%l'], 
-                                   capture_output=True, text=True, timeout=10)
-            
-            if result.returncode != 0:
-                return []
-            
             queued_jobs = []
-            
-            for line in result.stdout.split('\n')[1:]:
-                if not line or '|' not in line:
+
+            for line in stdout.splitlines()[1:]:
+                # Cheap substring reject before any field splitting: non-GPU
+                # rows (the bulk of squeue output on mixed clusters) never
+                # reach the per-field parsing below
+                if 'gpu' not in line:
                     continue
                 parts = line.split('|')
-                if len(parts) >= 5:
-                    user = parts[0]
-                    state = parts[1]
-                    gres = parts[2]
-                    jobname = parts[3]
-                    jobid = parts[4]
-                    priority = parts[5] if len(parts) > 5 else 'N/A'
-                    start_time = parts[6] if len(parts) > 6 else 'N/A'
-                    time_limit = parts[7] if len(parts) > 7 else '1:00:00'
-                    
-                    if state == 'PENDING' and 'gpu' in gres:
-                        gpu_match = re.search(r'gpu:(\w+:)?(\d+)', gres)
-                        if gpu_match:
-                            gpu_type = gpu_match.group(1).rstrip(':') if gpu_match.group(1) else 'Any'
-                            gpu_count = int(gpu_match.group(2))
-                            
-                            # Parse time limit to hours
-                            gpu_hours = SlurmCommands.parse_time_to_hours(time_limit) * gpu_count
-                            
-                            queued_jobs.append({
+                if len(parts) < 5:
+                    continue
+                nodelist = parts[0]
+                user = parts[1]
+                state = parts[2]
+                gres = parts[3]
+                jobname = parts[4]
+                jobid = parts[5] if len(parts) > 5 else 'N/A'
+                priority = parts[6] if len(parts) > 6 else 'N/A'
+                start_time = parts[7] if len(parts) > 7 else 'N/A'
+                time_limit = parts[8] if len(parts) > 8 else '1:00:00'
+
+                if 'gpu' not in gres:
+                    continue
+
+                if state == 'RUNNING':
+                    gpu_match = _GPU_REQ_RE.search(gres)
+                    if gpu_match:
+                        gpu_count = int(gpu_match.group(2))
+
+                        # For job allocations, we need to handle per-node GPU count differently
+                        # The GPU count in squeue is total for the job, not per node
+                        nodes = SlurmCommands.expand_nodelist(nodelist)
+                        gpu_per_node = gpu_count // len(nodes) if len(nodes) > 0 else gpu_count
+                        for node in nodes:
+                            allocations[node]['users'].add(user)
+                            allocations[node]['jobs'].append({
                                 'user': user,
                                 'job': jobname,
                                 'jobid': jobid,
-                                'gpu_type': gpu_type,
-                                'gpu_count': gpu_count,
-                                'gpu_hours': gpu_hours,
-                                'priority': priority,
-                                'estimated_start': start_time
+                                'gpus': gpu_per_node
                             })
-            
-            return queued_jobs
+                elif state == 'PENDING':
+                    gpu_match = _GPU_REQ_RE.search(gres)
+                    if gpu_match:
+                        gpu_type = gpu_match.group(1).rstrip(':') if gpu_match.group(1) else 'Any'
+                        gpu_count = int(gpu_match.group(2))
+
+                        # Parse time limit to hours
+                        gpu_hours = SlurmCommands.parse_time_to_hours(time_limit) * gpu_count
+
+                        queued_jobs.append({
+                            'user': user,
+                            'job': jobname,
+                            'jobid': jobid,
+                            'gpu_type': gpu_type,
+                            'gpu_count': gpu_count,
+                            'gpu_hours': gpu_hours,
+                            'priority': priority,
+                            'estimated_start': start_time
+                        })
+
+            SlurmCommands._parse_cache['jobs'] = (digest, (allocations, queued_jobs))
+            return allocations, queued_jobs
         except Exception as e:
-            return []
-    
+            # Drop the stale digest so the empty result forces a UI update
+            SlurmCommands._parse_cache.pop('jobs', None)
+            return {}, []
+
     @staticmethod
+    def expand_nodelist_py(nodelist):
+        """Expand Slurm's compressed nodelist grammar (node[01-08,10],node12) in-process"""
+        # Split on commas outside brackets
+        tokens = []
+        depth = 0
+        start = 0
+        for i, char in enumerate(nodelist):
+            if char == '[':
+                depth += 1
+            elif char == ']':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                tokens.append(nodelist[start:i])
+                start = i + 1
+        tokens.append(nodelist[start:])
+
+        nodes = []
+        for token in tokens:
+            match = _NODELIST_RANGE_RE.match(token)
+            if not match:
+                if '[' in token or ']' in token:
+                    # Grammar we don't handle (e.g. nested dimensions);
+                    # let expand_nodelist fall back to scontrol
+                    raise ValueError(f"unsupported nodelist token: {token}")
+                nodes.append(token)
+                continue
+            prefix, body = match.group(1), match.group(2)
+            for part in body.split(','):
+                if '-' in part:
+                    lo, hi = part.split('-')
+                    width = len(lo)  # preserve zero-padding, e.g. 01-08
+                    for n in range(int(lo), int(hi) + 1):
+                        nodes.append(f"{prefix}{n:0{width}d}")
+                else:
+                    nodes.append(f"{prefix}{part}")
+        return nodes
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def expand_nodelist(nodelist):
-        """Expand Slurm nodelist format to individual nodes"""
+        """Expand Slurm nodelist format to individual nodes
+
+        Long-running jobs repeat the same nodelist strings every tick, so
+        memoize the whole expansion (returning an immutable tuple) including
+        the scontrol fallback. Manual refresh clears the cache.
+        """
+        # Expanding in-process avoids one scontrol fork per running job;
+        # fall back to scontrol only if the nodelist doesn't parse
+        try:
+            return tuple(SlurmCommands.expand_nodelist_py(nodelist))
+        except Exception:
+            pass
         try:
             result = subprocess.run(['scontrol', 'show', 'hostname', nodelist],
                                    capture_output=True, text=True, timeout=5)
-            return result.stdout.strip().split('\n')
+            return tuple(result.stdout.strip().split('\n'))
         except:
-            return [nodelist]
+            return (nodelist,)
     
     @staticmethod
     def parse_time_to_hours(time_str):
@@ -211,124 +365,114 @@ class OverviewWidget(Vertical):
         yield Label("", id="overview-status", classes="status")
         yield Label("🔥 Heavy Users (Current GPU Usage)", classes="subtitle")
         yield DataTable(id="overview-users-table", show_cursor=False)
-    
-    def update_data(self, nodes: list, allocations: dict):
-        """Update the overview display"""
-        # Hide loading, show tables
-        self.query_one("#overview-loading").display = False
+
+    def on_mount(self) -> None:
+        """Create the fixed table columns once; refreshes only replace rows"""
         table = self.query_one("#overview-table", DataTable)
-        table.display = True
-        users_table = self.query_one("#overview-users-table", DataTable)
-        users_table.display = True
-        
-        # Clear and setup table
-        table.clear(columns=True)
         table.add_column("GPU Type", width=12)
         table.add_column("Total", width=8)
         table.add_column("Used", width=8)
         table.add_column("Available", width=12)
         table.add_column("Usage %", width=10)
         table.add_column("Healthy Nodes", width=15)
+
+        users_table = self.query_one("#overview-users-table", DataTable)
+        users_table.add_column("User", width=20)
+        users_table.add_column("GPU Type", width=12)
+        users_table.add_column("GPUs Used", width=10)
+        users_table.add_column("Nodes", width=30)
+
+    def update_data(self, nodes: list, allocations: dict, gpu_summary: Optional[dict] = None,
+                    user_gpu_summary: Optional[dict] = None):
+        """Update the overview display"""
+        # Hide loading, show tables
+        self.query_one("#overview-loading").display = False
+        table = self.query_one("#overview-table", DataTable)
+        table.display = True
+        users_table = self.query_one("#overview-users-table", DataTable)
+        users_table.display = True
         
-        # Calculate summary
-        gpu_summary = defaultdict(lambda: {
-            'total': 0, 'used': 0, 'nodes': 0, 
-            'drain_nodes': 0, 'true_available': 0
-        })
-        
-        for node in nodes:
-            if 'gpu_type' in node:
-                gpu_type = node['gpu_type']
-                total = node.get('gpu_total', 0)
-                used = node.get('gpu_used', 0)
-                state = node.get('state', '')
-                
-                gpu_summary[gpu_type]['total'] += total
-                gpu_summary[gpu_type]['used'] += used
-                gpu_summary[gpu_type]['nodes'] += 1
-                
-                is_healthy = 'DRAIN' not in state and 'DOWN' not in state
-                if not is_healthy:
-                    gpu_summary[gpu_type]['drain_nodes'] += 1
-                else:
-                    gpu_summary[gpu_type]['true_available'] += (total - used)
-        
+        # Columns are fixed (created in on_mount); only replace the rows
+        table.clear()
+
+        # Use the shared summary when the app already computed it this refresh
+        if gpu_summary is None:
+            gpu_summary = build_gpu_summary(nodes)
+
         # Add rows
         total_available = 0
+        rows = []
         for gpu_type in sorted(gpu_summary.keys()):
             info = gpu_summary[gpu_type]
             usage_pct = (info['used'] / info['total'] * 100) if info['total'] > 0 else 0
             healthy = info['nodes'] - info['drain_nodes']
             total_available += info['true_available']
-            
+
             # Color code availability
             avail_str = f"{info['true_available']}"
             if info['true_available'] > 0:
                 avail_str = f"✅ {info['true_available']}"
             else:
                 avail_str = f"❌ {info['true_available']}"
-            
-            table.add_row(
+
+            rows.append((
                 gpu_type,
                 str(info['total']),
                 str(info['used']),
                 avail_str,
                 f"{usage_pct:.1f}%",
                 f"{healthy}/{info['nodes']}"
-            )
+            ))
+        table.add_rows(rows)
         
         # Update status
         status = self.query_one("#overview-status", Label)
+        # set_classes replaces the class list in one shot; add_class here would
+        # accumulate both success and warning after a few refreshes
         if total_available > 0:
             status.update(f"✅ Total GPUs Available: {total_available}")
-            status.add_class("success")
+            status.set_classes(("status", "success"))
         else:
             status.update("❌ No GPUs Currently Available")
-            status.add_class("warning")
+            status.set_classes(("status", "warning"))
         
         # Add heavy users table
-        users_table.clear(columns=True)
-        users_table.add_column("User", width=20)
-        users_table.add_column("GPU Type", width=12)
-        users_table.add_column("GPUs Used", width=10)
-        users_table.add_column("Nodes", width=30)
-        
-        # Calculate user GPU usage
-        user_gpu_summary = defaultdict(lambda: defaultdict(lambda: {'count': 0, 'nodes': set()}))
-        
-        # Debug: Check if allocations has data
-        if allocations:
-            for node_name, alloc_info in allocations.items():
-                # Find node info to get GPU type
-                node_info = next((n for n in nodes if n.get('name') == node_name), None)
-                if node_info and 'gpu_type' in node_info:
-                    gpu_type = node_info['gpu_type']
-                    for job in alloc_info.get('jobs', []):
-                        user_gpu_summary[job['user']][gpu_type]['count'] += job['gpus']
-                        user_gpu_summary[job['user']][gpu_type]['nodes'].add(node_name)
-        
+        users_table.clear()
+
+        # Use the shared per-user aggregation when the app already computed it
+        if user_gpu_summary is None:
+            user_gpu_summary = build_user_gpu_summary(nodes, allocations)
+
         # Sort users by total GPU usage
-        user_totals = {user: sum(gpu_data['count'] for gpu_data in gpus.values()) 
-                       for user, gpus in user_gpu_summary.items()}
-        
+        user_totals = {}
+        for (user, _), gpu_data in user_gpu_summary.items():
+            user_totals[user] = user_totals.get(user, 0) + gpu_data['count']
+
         # Show top 5 heavy users
-        for user in sorted(user_totals.keys(), key=lambda u: user_totals[u], reverse=True)[:5]:
-            for gpu_type in sorted(user_gpu_summary[user].keys()):
-                gpu_data = user_gpu_summary[user][gpu_type]
-                nodes_str = ', '.join(sorted(list(gpu_data['nodes']))[:3])
-                if len(gpu_data['nodes']) > 3:
-                    nodes_str += f" (+{len(gpu_data['nodes'])-3} more)"
-                
-                users_table.add_row(
+        user_rows = []
+        top_users = [user for user, _ in heapq.nlargest(5, user_totals.items(), key=lambda kv: kv[1])]
+        for user in top_users:
+            user_keys = sorted(key for key in user_gpu_summary if key[0] == user)
+            for key in user_keys:
+                gpu_data = user_gpu_summary[key]
+                # nsmallest picks the 3 shown nodes without sorting the whole set
+                top_nodes = heapq.nsmallest(3, gpu_data['nodes'])
+                nodes_str = ', '.join(top_nodes)
+                extra = len(gpu_data['nodes']) - len(top_nodes)
+                if extra > 0:
+                    nodes_str += f" (+{extra} more)"
+
+                user_rows.append((
                     user,
-                    gpu_type,
+                    key[1],
                     str(gpu_data['count']),
                     nodes_str
-                )
-        
-        if not user_gpu_summary:
+                ))
+
+        if not user_rows:
             # If no users found, show a message
-            users_table.add_row("No active GPU users", "-", "-", "-")
+            user_rows.append(("No active GPU users", "-", "-", "-"))
+        users_table.add_rows(user_rows)
     
     def show_loading(self):
         """Show loading indicator"""
@@ -344,22 +488,29 @@ class NodesWidget(Vertical):
         with Center():
             yield LoadingIndicator(id="nodes-loading")
         yield DataTable(id="nodes-table", show_cursor=False)
-    
+
+    def on_mount(self) -> None:
+        """Create the fixed table columns once; refreshes only replace rows"""
+        table = self.query_one("#nodes-table", DataTable)
+        self._col_keys = [
+            table.add_column("Node", width=20),
+            table.add_column("State", width=15),
+            table.add_column("GPU Type", width=10),
+            table.add_column("Total", width=8),
+            table.add_column("Used", width=8),
+            table.add_column("Available", width=10),
+            table.add_column("Users", width=30),
+        ]
+        # Previous row tuples keyed by node name, for diff updates
+        self._prev_rows = {}
+
     def update_data(self, nodes: list, allocations: dict):
         """Update the nodes display"""
         self.query_one("#nodes-loading").display = False
         table = self.query_one("#nodes-table", DataTable)
         table.display = True
-        
-        table.clear(columns=True)
-        table.add_column("Node", width=20)
-        table.add_column("State", width=15)
-        table.add_column("GPU Type", width=10)
-        table.add_column("Total", width=8)
-        table.add_column("Used", width=8)
-        table.add_column("Available", width=10)
-        table.add_column("Users", width=30)
-        
+
+        new_rows = {}
         for node in sorted(nodes, key=lambda x: x.get('name', '')):
             if 'gpu_type' in node:
                 total = node.get('gpu_total', 0)
@@ -383,7 +534,7 @@ class NodesWidget(Vertical):
                 if not users:
                     users = '-'
                 
-                table.add_row(
+                new_rows[node['name']] = (
                     node['name'],
                     state_str,
                     node['gpu_type'],
@@ -392,7 +543,23 @@ class NodesWidget(Vertical):
                     str(available),
                     users
                 )
-    
+
+        # Diff against the previous refresh: when the node set is stable (the
+        # common case) only changed cells are touched, so Textual avoids a full
+        # clear-and-relayout. A membership change rebuilds to keep sort order.
+        if new_rows.keys() != self._prev_rows.keys():
+            table.clear()
+            for name, row in new_rows.items():
+                table.add_row(*row, key=name)
+        else:
+            for name, row in new_rows.items():
+                prev = self._prev_rows[name]
+                if row != prev:
+                    for col_key, old_val, new_val in zip(self._col_keys, prev, row):
+                        if old_val != new_val:
+                            table.update_cell(name, col_key, new_val)
+        self._prev_rows = new_rows
+
     def show_loading(self):
         """Show loading indicator"""
         self.query_one("#nodes-loading").display = True
@@ -409,81 +576,103 @@ class QueueWidget(Vertical):
         yield DataTable(id="queue-summary-table", show_cursor=False)
         yield Label("⏳ PENDING Jobs - Queue by User (Top 10):", classes="subtitle")
         yield DataTable(id="queue-users-table", show_cursor=False)
-    
+
+    def on_mount(self) -> None:
+        """Create the fixed table columns once; refreshes only replace rows"""
+        summary_table = self.query_one("#queue-summary-table", DataTable)
+        summary_table.add_column("GPU Type", width=15)
+        summary_table.add_column("Pending Jobs", width=12)
+        summary_table.add_column("GPUs Requested", width=12)
+        summary_table.add_column("GPU Hours", width=12)
+        summary_table.add_column("Unique Users", width=12)
+
+        users_table = self.query_one("#queue-users-table", DataTable)
+        users_table.add_column("User", width=20)
+        users_table.add_column("GPU Type", width=12)
+        users_table.add_column("Pending Jobs", width=12)
+        users_table.add_column("GPUs", width=8)
+        users_table.add_column("GPU Hours", width=12)
+
     def update_data(self, queued_jobs: list):
         """Update the queue display"""
         # Hide loading, show both tables
         self.query_one("#queue-loading").display = False
-        
+
         # Summary table
         summary_table = self.query_one("#queue-summary-table", DataTable)
         summary_table.display = True
-        summary_table.clear(columns=True)
-        
-        summary_table.add_column("GPU Type", width=15)
-        summary_table.add_column("Pending Jobs", width=12)
-        summary_table.add_column("GPUs Requested", width=12)
-        summary_table.add_column("GPU Hours", width=12)
-        summary_table.add_column("Unique Users", width=12)
-        
-        # Aggregate data
-        gpu_type_summary = defaultdict(lambda: {'jobs': 0, 'gpus': 0, 'gpu_hours': 0, 'users': set()})
-        user_queue_summary = defaultdict(lambda: defaultdict(lambda: {'jobs': 0, 'gpus': 0, 'gpu_hours': 0}))
-        
+        summary_table.clear()
+
+        # Aggregate data; flat (user, gpu_type) keys replace nested defaultdicts
+        gpu_type_summary = {}
+        user_queue_summary = {}
+
         for job in queued_jobs:
             gpu_type = job['gpu_type']
             user = job['user']
             gpu_hours = job.get('gpu_hours', job['gpu_count'])
-            
-            gpu_type_summary[gpu_type]['jobs'] += 1
-            gpu_type_summary[gpu_type]['gpus'] += job['gpu_count']
-            gpu_type_summary[gpu_type]['gpu_hours'] += gpu_hours
-            gpu_type_summary[gpu_type]['users'].add(user)
-            
-            user_queue_summary[user][gpu_type]['jobs'] += 1
-            user_queue_summary[user][gpu_type]['gpus'] += job['gpu_count']
-            user_queue_summary[user][gpu_type]['gpu_hours'] += gpu_hours
+
+            info = gpu_type_summary.get(gpu_type)
+            if info is None:
+                info = {'jobs': 0, 'gpus': 0, 'gpu_hours': 0, 'users': set()}
+                gpu_type_summary[gpu_type] = info
+            info['jobs'] += 1
+            info['gpus'] += job['gpu_count']
+            info['gpu_hours'] += gpu_hours
+            info['users'].add(user)
+
+            key = (user, gpu_type)
+            data = user_queue_summary.get(key)
+            if data is None:
+                data = {'jobs': 0, 'gpus': 0, 'gpu_hours': 0}
+                user_queue_summary[key] = data
+            data['jobs'] += 1
+            data['gpus'] += job['gpu_count']
+            data['gpu_hours'] += gpu_hours
+
+        # Only the cardinality is displayed, so release the user sets as soon
+        # as it is known instead of carrying them through rendering
+        for info in gpu_type_summary.values():
+            info['users'] = len(info['users'])
         
         # Add summary rows
         if gpu_type_summary:
-            for gpu_type in sorted(gpu_type_summary.keys()):
-                info = gpu_type_summary[gpu_type]
-                summary_table.add_row(
-                    gpu_type,
-                    f"⏳ {info['jobs']}",
-                    str(info['gpus']),
-                    f"{info['gpu_hours']:.1f}",
-                    str(len(info['users']))
-                )
+            summary_table.add_rows(
+                (gpu_type,
+                 f"⏳ {info['jobs']}",
+                 str(info['gpus']),
+                 f"{info['gpu_hours']:.1f}",
+                 str(info['users']))
+                for gpu_type, info in sorted(gpu_type_summary.items())
+            )
         else:
             summary_table.add_row("✅ No pending jobs", "-", "-", "-", "-")
-        
+
         # Users table
         users_table = self.query_one("#queue-users-table", DataTable)
         users_table.display = True
-        users_table.clear(columns=True)
-        
-        users_table.add_column("User", width=20)
-        users_table.add_column("GPU Type", width=12)
-        users_table.add_column("Pending Jobs", width=12)
-        users_table.add_column("GPUs", width=8)
-        users_table.add_column("GPU Hours", width=12)
-        
+        users_table.clear()
+
         if user_queue_summary:
             # Sort users by total GPU hours requested
-            user_totals = {user: sum(gpu['gpu_hours'] for gpu in gpus.values()) 
-                           for user, gpus in user_queue_summary.items()}
-            
-            for user in sorted(user_totals.keys(), key=lambda u: user_totals[u], reverse=True)[:10]:
-                for gpu_type in sorted(user_queue_summary[user].keys()):
-                    data = user_queue_summary[user][gpu_type]
-                    users_table.add_row(
+            user_totals = {}
+            for (user, _), data in user_queue_summary.items():
+                user_totals[user] = user_totals.get(user, 0) + data['gpu_hours']
+
+            user_rows = []
+            top_users = [user for user, _ in heapq.nlargest(10, user_totals.items(), key=lambda kv: kv[1])]
+            for user in top_users:
+                user_keys = sorted(key for key in user_queue_summary if key[0] == user)
+                for key in user_keys:
+                    data = user_queue_summary[key]
+                    user_rows.append((
                         user,
-                        gpu_type,
+                        key[1],
                         f"⏳ {data['jobs']}",
                         str(data['gpus']),
                         f"{data['gpu_hours']:.1f}"
-                    )
+                    ))
+            users_table.add_rows(user_rows)
         else:
             users_table.add_row("No queued jobs", "-", "-", "-", "-")
     
@@ -560,16 +749,56 @@ class SlurmMonitorApp(App):
         super().__init__()
         self.db_path = db_path
         self.refresh_interval = refresh_interval
+        # Validate the webhook once at startup instead of failing silently on
+        # every send; a malformed URL disables Discord integration outright
+        if webhook_url:
+            parts = urllib.parse.urlsplit(webhook_url)
+            if parts.scheme not in ('http', 'https') or not parts.netloc:
+                webhook_url = None
         self.webhook_url = webhook_url
         self.nodes = []
         self.allocations = {}
         self.queued_jobs = []
-        self.last_discord_notify = None
+        self.gpu_summary = {}
+        self.user_gpu_summary = {}
+        self._queued_gpu_total = 0
+        self._sorted_gpu_types = ()
+        self._sorted_gpu_types_src = None
+        self._notify_field_names = {}
+        self._last_notify_monotonic = 0.0
+        self._notify_state_fp = None
+        self._last_sent_summary = None
         self.discord_interval = 1800  # 30 minutes default
-        
-        # Don't create DB connection in main thread if using threads
+        self.discord_min_delta = 1  # GPUs changed before another send
+        self.discord_max_interval = 7200  # always send after 2h of drift
+        self._db_conn = None  # lazily created in the worker thread
+        self._db_cursor = None
+        self._last_db_sig = None
+        self._last_db_heartbeat = 0.0
+        self.db_heartbeat = 300  # seconds between forced snapshots when idle
+        self._terminal_focused = True
+        self._refresh_skipped = False
+        self._last_ui_sig = None
+        self._force_ui_update = False
+
+        # Webhook delivery happens on a dedicated daemon thread so a slow
+        # Discord endpoint can never delay the refresh cycle. A single
+        # payload slot with latest-wins semantics bounds memory during
+        # outages: stale snapshots are overwritten, never queued
+        self._pending_payload = None
+        if self.webhook_url:
+            self._payload_lock = threading.Lock()
+            self._payload_ready = threading.Event()
+            threading.Thread(target=self._notify_worker, daemon=True).start()
+
+        # Row batches drain into SQLite on a dedicated writer thread, so an
+        # fsync stall never delays the refresh worker and the connection is
+        # confined to a single thread
+        self._db_queue = None
         if self.db_path:
             self.setup_database_schema()
+            self._db_queue = queue.Queue(maxsize=8)
+            threading.Thread(target=self._db_worker, daemon=True).start()
     
     def setup_database_schema(self):
         """Setup SQLite database schema (creates tables if needed)"""
@@ -640,6 +869,8 @@ class SlurmMonitorApp(App):
     
     async def on_mount(self) -> None:
         """Called when app starts"""
+        # Cache the tab container; tab switching shouldn't re-query the DOM
+        self._tabbed = self.query_one(TabbedContent)
         # Show loading initially
         self.show_all_loading()
         # Start background refresh
@@ -656,16 +887,85 @@ class SlurmMonitorApp(App):
         for widget in self.query(QueueWidget):
             widget.show_loading()
     
+    # AppBlur/AppFocus first appear in textual 0.48; string annotations keep
+    # imports working on the 0.40+ floor, where these handlers simply never fire
+    def on_app_blur(self, event: "events.AppBlur") -> None:
+        """Pause polling while the terminal is unfocused"""
+        self._terminal_focused = False
+
+    def on_app_focus(self, event: "events.AppFocus") -> None:
+        """Resume polling and catch up on any refresh skipped while unfocused"""
+        self._terminal_focused = True
+        if self._refresh_skipped:
+            self._refresh_skipped = False
+            self.refresh_data_worker()
+
+    def on_unmount(self) -> None:
+        """Ask the writer thread to optimize and close the database"""
+        if self._db_queue is not None:
+            # The worker drains continuously, so a short blocking put almost
+            # always lands; only a truly wedged writer forfeits the clean close
+            try:
+                self._db_queue.put(None, timeout=5)
+            except queue.Full:
+                pass
+
     @work(thread=True)
     def refresh_data_worker(self) -> None:
         """Refresh all data from Slurm in background"""
-        # Fetch data
-        self.nodes = SlurmCommands.get_node_info()
-        self.allocations = SlurmCommands.get_job_allocations()
-        self.queued_jobs = SlurmCommands.get_queued_jobs()
-        
-        # Update UI in main thread
-        self.call_from_thread(self.update_ui)
+        # Don't hammer slurmctld while nobody is looking at the dashboard;
+        # the skipped refresh is replayed as soon as focus returns
+        if not self._terminal_focused:
+            self._refresh_skipped = True
+            return
+
+        # Fetch data - the Slurm commands are independent blocking subprocesses,
+        # so run them concurrently to cut refresh time to the slowest of the three
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            nodes_future = pool.submit(SlurmCommands.get_node_info)
+            jobs_future = pool.submit(SlurmCommands.get_all_jobs)
+            self.nodes = nodes_future.result()
+            self.allocations, self.queued_jobs = jobs_future.result()
+
+        # Aggregate once; the overview widget, DB logging and Discord all share it
+        self.gpu_summary = build_gpu_summary(self.nodes)
+        self.user_gpu_summary = build_user_gpu_summary(self.nodes, self.allocations)
+
+        # Fold the queued-GPU demand into the same summary in one pass over the
+        # queue; types with no matching nodes (e.g. 'Any') only count toward
+        # the overall total
+        queued_total = 0
+        summary_get = self.gpu_summary.get
+        for job in self.queued_jobs:
+            count = job['gpu_count']
+            queued_total += count
+            info = summary_get(job['gpu_type'])
+            if info is not None:
+                info['requested'] += count
+        self._queued_gpu_total = queued_total
+
+        # GPU types in a cluster rarely change; re-sort only when the key set does
+        gpu_type_keys = frozenset(self.gpu_summary)
+        if gpu_type_keys != self._sorted_gpu_types_src:
+            self._sorted_gpu_types_src = gpu_type_keys
+            self._sorted_gpu_types = tuple(sorted(gpu_type_keys))
+            # Field titles only depend on the type name; build them alongside
+            # the sort so notifications reuse interned strings
+            self._notify_field_names = {gt: f"{gt} GPUs" for gt in self._sorted_gpu_types}
+
+        # Update UI in main thread, but only the widgets whose inputs changed.
+        # The parse-cache digests double as a cheap change signature; failure
+        # paths evict their digest, so an empty result always repaints rather
+        # than masquerading as "unchanged".
+        ui_sig = (SlurmCommands._parse_cache.get('nodes', (None,))[0],
+                  SlurmCommands._parse_cache.get('jobs', (None,))[0])
+        last_sig = self._last_ui_sig or (None, None)
+        nodes_changed = self._force_ui_update or ui_sig[0] is None or ui_sig[0] != last_sig[0]
+        jobs_changed = self._force_ui_update or ui_sig[1] is None or ui_sig[1] != last_sig[1]
+        if nodes_changed or jobs_changed:
+            self._force_ui_update = False
+            self._last_ui_sig = ui_sig
+            self.call_from_thread(self.update_ui, nodes_changed, jobs_changed)
         
         # Log to database if enabled
         if self.db_path:
@@ -675,164 +975,235 @@ class SlurmMonitorApp(App):
         if self.webhook_url:
             self.send_discord_notification()
     
-    def update_ui(self):
-        """Update all widgets with new data"""
-        # Update all widgets
-        for widget in self.query(OverviewWidget):
-            widget.update_data(self.nodes, self.allocations)
-        for widget in self.query(NodesWidget):
-            widget.update_data(self.nodes, self.allocations)
-        for widget in self.query(QueueWidget):
-            widget.update_data(self.queued_jobs)
+    def update_ui(self, nodes_changed: bool = True, jobs_changed: bool = True):
+        """Update the widgets whose underlying data changed"""
+        # Overview and Nodes read both node and allocation data; Queue only
+        # depends on squeue output, so a node-only change skips its rebuild
+        if nodes_changed or jobs_changed:
+            for widget in self.query(OverviewWidget):
+                widget.update_data(self.nodes, self.allocations, self.gpu_summary,
+                                   self.user_gpu_summary)
+            for widget in self.query(NodesWidget):
+                widget.update_data(self.nodes, self.allocations)
+        if jobs_changed:
+            for widget in self.query(QueueWidget):
+                widget.update_data(self.queued_jobs)
     
+    def _get_db_conn(self):
+        """Lazily create the writer thread's persistent SQLite connection"""
+        if self._db_conn is None:
+            # isolation_level=None puts sqlite3 in autocommit so the worker
+            # controls transaction boundaries with explicit BEGIN/COMMIT
+            self._db_conn = sqlite3.connect(self.db_path, isolation_level=None)
+            # WAL avoids a full fsync per commit; NORMAL is safe with WAL.
+            # The remaining pragmas keep temp structures and hot pages in
+            # memory and stop concurrent readers from erroring out
+            self._db_conn.executescript(
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA cache_size=-16384;'
+                'PRAGMA mmap_size=67108864;'
+                'PRAGMA busy_timeout=3000;'
+            )
+            # One long-lived cursor serves every logging tick
+            self._db_cursor = self._db_conn.cursor()
+        return self._db_conn
+
     def log_to_database(self):
         """Log current state to database"""
         if not self.db_path:
             return
-        
-        # Create connection in worker thread
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+
+        # Elide the snapshot when both Slurm outputs are identical to the
+        # last logged tick; an idle cluster would otherwise fill the DB with
+        # duplicate rows overnight. A heartbeat row set still goes in every
+        # db_heartbeat seconds so gaps in the time series stay bounded
+        now_monotonic = time.monotonic()
+        db_sig = (SlurmCommands._parse_cache.get('nodes', (None,))[0],
+                  SlurmCommands._parse_cache.get('jobs', (None,))[0])
+        if None not in db_sig and db_sig == self._last_db_sig and \
+                now_monotonic - self._last_db_heartbeat < self.db_heartbeat:
+            return
+        self._last_db_sig = db_sig
+        self._last_db_heartbeat = now_monotonic
+
         timestamp = datetime.now()
         
-        # Calculate and log GPU availability
-        gpu_summary = defaultdict(lambda: {
-            'total': 0, 'used': 0, 'true_available': 0, 'nodes': 0, 'drain_nodes': 0
-        })
-        
-        for node in self.nodes:
-            if 'gpu_type' in node:
-                gpu_type = node['gpu_type']
-                total = node.get('gpu_total', 0)
-                used = node.get('gpu_used', 0)
-                state = node.get('state', '')
-                
-                gpu_summary[gpu_type]['total'] += total
-                gpu_summary[gpu_type]['used'] += used
-                gpu_summary[gpu_type]['nodes'] += 1
-                
-                is_healthy = 'DRAIN' not in state and 'DOWN' not in state
-                if not is_healthy:
-                    gpu_summary[gpu_type]['drain_nodes'] += 1
-                else:
-                    gpu_summary[gpu_type]['true_available'] += (total - used)
-        
-        for gpu_type, info in gpu_summary.items():
-            cursor.execute('''
-                INSERT INTO gpu_availability 
-                (timestamp, gpu_type, total, used, available, true_available, nodes_total, nodes_healthy)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                timestamp, gpu_type, 
-                info['total'], info['used'], 
-                info['total'] - info['used'],
-                info['true_available'],
-                info['nodes'],
-                info['nodes'] - info['drain_nodes']
-            ))
-        
-        # Log user usage
-        user_gpu_summary = defaultdict(lambda: defaultdict(lambda: {'count': 0, 'jobs': 0}))
-        
-        for node_name, alloc_info in self.allocations.items():
-            # Find node info to get GPU type
-            node_info = next((n for n in self.nodes if n.get('name') == node_name), None)
-            if node_info and 'gpu_type' in node_info:
-                gpu_type = node_info['gpu_type']
-                for job in alloc_info.get('jobs', []):
-                    user_gpu_summary[job['user']][gpu_type]['count'] += job['gpus']
-                    user_gpu_summary[job['user']][gpu_type]['jobs'] += 1
+        # Log GPU availability from the summary computed this refresh
+        gpu_summary = self.gpu_summary
+        availability_rows = [
+            (timestamp, gpu_type,
+             info['total'], info['used'],
+             info['total'] - info['used'],
+             info['true_available'],
+             info['nodes'],
+             info['nodes'] - info['drain_nodes'])
+            for gpu_type, info in gpu_summary.items()
+        ]
         
-        for user, gpu_data in user_gpu_summary.items():
-            for gpu_type, counts in gpu_data.items():
-                cursor.execute('''
-                    INSERT INTO user_usage
-                    (timestamp, user, gpu_type, gpu_count, job_count)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (timestamp, user, gpu_type, counts['count'], counts['jobs']))
+        # Log user usage from the per-user aggregation shared with the overview
+        user_usage_rows = [
+            (timestamp, user, gpu_type, gpu_data['count'], gpu_data['jobs'])
+            for (user, gpu_type), gpu_data in self.user_gpu_summary.items()
+        ]
         
         # Log queue status
-        queue_summary = defaultdict(lambda: {'jobs': 0, 'gpus': 0, 'users': set()})
-        
+        queue_summary = {}
+
         for job in self.queued_jobs:
             gpu_type = job['gpu_type']
-            queue_summary[gpu_type]['jobs'] += 1
-            queue_summary[gpu_type]['gpus'] += job['gpu_count']
-            queue_summary[gpu_type]['users'].add(job['user'])
-        
-        for gpu_type, info in queue_summary.items():
-            cursor.execute('''
-                INSERT INTO queue_status
-                (timestamp, gpu_type, queued_jobs, queued_gpus, unique_users)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (timestamp, gpu_type, info['jobs'], info['gpus'], len(info['users'])))
-        
+            info = queue_summary.get(gpu_type)
+            if info is None:
+                info = {'jobs': 0, 'gpus': 0, 'users': set()}
+                queue_summary[gpu_type] = info
+            info['jobs'] += 1
+            info['gpus'] += job['gpu_count']
+            info['users'].add(job['user'])
+
+        # Only the user count is persisted; drop the sets here
+        queue_rows = [
+            (timestamp, gpu_type, info['jobs'], info['gpus'], len(info.pop('users')))
+            for gpu_type, info in queue_summary.items()
+        ]
+
         # Log node status
-        for node in self.nodes:
-            if 'gpu_type' in node:
-                cursor.execute('''
+        node_rows = [
+            (timestamp,
+             node.get('name', 'unknown'),
+             node.get('state', 'unknown'),
+             node['gpu_type'],
+             node.get('gpu_total', 0),
+             node.get('gpu_used', 0))
+            for node in self.nodes if 'gpu_type' in node
+        ]
+
+        # Hand the batch to the writer thread; if it is backed up behind a
+        # slow disk, drop the oldest snapshot rather than block the refresh
+        batch = (availability_rows, user_usage_rows, queue_rows, node_rows)
+        try:
+            self._db_queue.put_nowait(batch)
+        except queue.Full:
+            try:
+                self._db_queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._db_queue.put_nowait(batch)
+            except queue.Full:
+                pass
+
+    def _db_worker(self):
+        """Drain row batches into SQLite; runs on a daemon thread"""
+        while True:
+            batch = self._db_queue.get()
+            if batch is None:
+                # Shutdown sentinel: refresh planner statistics and close the
+                # connection from the thread that owns it
+                if self._db_conn is not None:
+                    try:
+                        self._db_conn.execute('PRAGMA optimize')
+                        self._db_conn.close()
+                    except Exception:
+                        pass
+                return
+            availability_rows, user_usage_rows, queue_rows, node_rows = batch
+            conn = None
+            try:
+                conn = self._get_db_conn()
+                cursor = self._db_cursor
+
+                # One executemany per table, all in one explicit transaction
+                cursor.execute('BEGIN')
+                cursor.executemany('''
+                    INSERT INTO gpu_availability
+                    (timestamp, gpu_type, total, used, available, true_available, nodes_total, nodes_healthy)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', availability_rows)
+                cursor.executemany('''
+                    INSERT INTO user_usage
+                    (timestamp, user, gpu_type, gpu_count, job_count)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', user_usage_rows)
+                cursor.executemany('''
+                    INSERT INTO queue_status
+                    (timestamp, gpu_type, queued_jobs, queued_gpus, unique_users)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', queue_rows)
+                cursor.executemany('''
                     INSERT INTO node_status
                     (timestamp, node_name, state, gpu_type, total_gpus, used_gpus)
                     VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    timestamp,
-                    node.get('name', 'unknown'),
-                    node.get('state', 'unknown'),
-                    node['gpu_type'],
-                    node.get('gpu_total', 0),
-                    node.get('gpu_used', 0)
-                ))
-        
-        conn.commit()
-        conn.close()
-    
+                ''', node_rows)
+                cursor.execute('COMMIT')
+            except Exception:
+                # Logging must never take the monitor down
+                try:
+                    if conn is not None:
+                        conn.execute('ROLLBACK')
+                except Exception:
+                    pass
+
     def send_discord_notification(self):
         """Send status update to Discord webhook"""
         if not self.webhook_url:
             return
         
-        # Check if enough time has passed since last notification
-        now = datetime.now()
-        if self.last_discord_notify:
-            time_diff = (now - self.last_discord_notify).total_seconds()
-            if time_diff < self.discord_interval:
+        # Gate on a monotonic clock (immune to wall-clock jumps) and skip the
+        # whole payload build when the cluster state hasn't changed since the
+        # last notification
+        now_monotonic = time.monotonic()
+        if self._last_notify_monotonic and \
+                now_monotonic - self._last_notify_monotonic < self.discord_interval:
+            return
+
+        state_fp = hash(tuple((n.get('name'), n.get('gpu_used'), n.get('state'))
+                              for n in self.nodes))
+        if state_fp == self._notify_state_fp:
+            return
+
+        # Reuse the shared GPU summary computed this refresh
+        gpu_summary = self.gpu_summary
+
+        # Hysteresis: cosmetic state changes (a node flapping between
+        # equivalent states) shouldn't fire a webhook; require the aggregate
+        # GPU numbers to move by at least discord_min_delta unless
+        # discord_max_interval has elapsed
+        current_summary = {gt: (info['total'], info['used'], info['true_available'])
+                           for gt, info in gpu_summary.items()}
+        if self._last_sent_summary is not None and \
+                now_monotonic - self._last_notify_monotonic < self.discord_max_interval:
+            delta = 0
+            for gpu_type, vals in current_summary.items():
+                prev = self._last_sent_summary.get(gpu_type, (0, 0, 0))
+                delta += sum(abs(a - b) for a, b in zip(vals, prev))
+            delta += sum(sum(vals) for gpu_type, vals in self._last_sent_summary.items()
+                         if gpu_type not in current_summary)
+            if delta < self.discord_min_delta:
                 return
+
+        self._last_notify_monotonic = now_monotonic
+        self._notify_state_fp = state_fp
+        self._last_sent_summary = current_summary
+
+        # Build the embed from the constant skeleton; the timestamp is only
+        # taken once we know a payload is actually going out, in UTC as
+        # Discord expects
+        embed = dict(self._EMBED_BASE)
+        embed["timestamp"] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        embed["fields"] = []
         
-        self.last_discord_notify = now
-        
-        # Calculate GPU summary
-        gpu_summary = defaultdict(lambda: {'total': 0, 'used': 0, 'available': 0})
-        
-        for node in self.nodes:
-            if 'gpu_type' in node:
-                gpu_type = node['gpu_type']
-                total = node.get('gpu_total', 0)
-                used = node.get('gpu_used', 0)
-                state = node.get('state', '')
-                
-                gpu_summary[gpu_type]['total'] += total
-                gpu_summary[gpu_type]['used'] += used
-                
-                is_healthy = 'DRAIN' not in state and 'DOWN' not in state
-                if is_healthy:
-                    gpu_summary[gpu_type]['available'] += (total - used)
-        
-        # Build Discord embed
-        embed = {
-            "title": "🖥️ GPU Cluster Status Update",
-            "color": 3447003,
-            "timestamp": now.isoformat(),
-            "fields": []
-        }
-        
-        # Add GPU availability fields
-        for gpu_type in sorted(gpu_summary.keys()):
+        # Add GPU availability fields, using the key order cached per refresh
+        for gpu_type in self._sorted_gpu_types:
             info = gpu_summary[gpu_type]
-            usage_pct = (info['used'] / info['total'] * 100) if info['total'] > 0 else 0
-            
+            # One-decimal percentage in integer arithmetic; skips the float
+            # division and format-spec parsing of f"{pct:.1f}"
+            total = info['total']
+            tenths = info['used'] * 1000 // total if total > 0 else 0
+
             field = {
-                "name": f"{gpu_type} GPUs",
-                "value": f"Available: {info['available']}/{info['total']} ({usage_pct:.1f}% used)",
+                "name": self._notify_field_names[gpu_type],
+                "value": f"Available: {info['true_available']}/{total} ({tenths // 10}.{tenths % 10}% used)",
                 "inline": True
             }
             embed["fields"].append(field)
@@ -840,46 +1211,78 @@ class SlurmMonitorApp(App):
         # Add queue summary
         total_queued = len(self.queued_jobs)
         if total_queued > 0:
-            queue_gpus = sum(job['gpu_count'] for job in self.queued_jobs)
+            queue_gpus = self._queued_gpu_total
             embed["fields"].append({
                 "name": "📋 Queue Status",
                 "value": f"{total_queued} jobs waiting for {queue_gpus} GPUs",
                 "inline": False
             })
         
-        # Send webhook
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json={"embeds": [embed]},
-                timeout=10
-            )
-            response.raise_for_status()
-        except Exception as e:
-            # Silently fail - don't interrupt monitoring
-            pass
+        # Hand the payload to the delivery thread; overwriting any snapshot
+        # still pending means the worker always posts the freshest state
+        with self._payload_lock:
+            self._pending_payload = {"embeds": [embed]}
+        self._payload_ready.set()
+
+    # Shared headers and embed skeleton for webhook posts; allocated once,
+    # not per notification
+    _JSON_HEADERS = {'Content-Type': 'application/json'}
+    _EMBED_BASE = {"title": "🖥️ GPU Cluster Status Update", "color": 3447003}
+
+    def _notify_worker(self):
+        """Deliver queued Discord payloads; runs on a daemon thread"""
+        # A persistent session keeps the TCP/TLS connection alive between posts
+        session = requests.Session()
+        while True:
+            self._payload_ready.wait()
+            with self._payload_lock:
+                payload = self._pending_payload
+                self._pending_payload = None
+                self._payload_ready.clear()
+            if payload is None:
+                continue
+            try:
+                # Serialize here (still off the refresh path) and post the raw
+                # body rather than going through requests' json= machinery
+                body = json.dumps(payload, separators=(',', ':'))
+                response = session.post(self.webhook_url, data=body,
+                                        headers=self._JSON_HEADERS, timeout=5)
+                response.raise_for_status()
+            except Exception:
+                # Silently fail - don't interrupt monitoring
+                pass
     
     def action_refresh(self) -> None:
         """Handle refresh action"""
         self.show_all_loading()
+        # Drop memoized nodelist expansions so a manual refresh reflects
+        # any renamed/repartitioned nodes
+        SlurmCommands.expand_nodelist.cache_clear()
+        # A manual refresh must repaint even if the data is unchanged,
+        # since the loading indicators are now showing
+        self._force_ui_update = True
         self.refresh_data_worker()
     
     def action_show_tab(self, tab: str) -> None:
         """Switch to a specific tab"""
-        tabbed_content = self.query_one(TabbedContent)
-        tabbed_content.active = tab
+        self._tabbed.active = tab
 
-def main():
-    """Entry point for TUI version"""
+# lru_cache rather than functools.cache: the latter needs Python 3.9+
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the CLI parser once; repeated entry calls reuse it"""
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='Slurm GPU Monitor - TUI Version')
     parser.add_argument('--db', action='store_true', help='Enable SQLite logging')
     parser.add_argument('--db-path', type=str, default='gpu_monitor.db', help='Database path')
     parser.add_argument('--interval', type=int, default=30, help='Refresh interval in seconds')
     parser.add_argument('--webhook', type=str, help='Discord webhook URL for notifications')
-    
-    args = parser.parse_args()
+    return parser
+
+def main():
+    """Entry point for TUI version"""
+    args = _build_parser().parse_args()
     
     # Check environment variable for webhook if not provided as argument
     webhook_url = args.webhook or os.environ.get('DISCORD_WEBHOOK_URL')